@@ -28,6 +28,15 @@ if TYPE_CHECKING:
     from ..http import HttpResourcePath
 
 
+# There are three possible formats for Content-Range. All of them start
+# with optional whitespace and a unit, which for our purposes should always
+# be "bytes":
+#   Content-Range: <unit> <range-start>-<range-end>/<size>
+#   Content-Range: <unit> <range-start>-<range-end>/*
+#   Content-Range: <unit> */<size>
+_CONTENT_RANGE_RE = re.compile(r"\s*bytes\s+(?:(\d+)-(\d+)/(?:(\d+)|\*)|\*/(\d+))")
+
+
 class HttpReadResourceHandle(BaseResourceHandle[bytes]):
     """HTTP-based specialization of `.BaseResourceHandle`.
 
@@ -47,6 +56,9 @@ class HttpReadResourceHandle(BaseResourceHandle[bytes]):
         Defaults to newline. If a file is opened in binary mode, this argument
         is not used, as binary files will only split lines on the binary
         newline representation.
+    total_size : `int`, optional
+        Size of the remote resource in bytes, if already known by the caller.
+        Defaults to -1 meaning the size is unknown.
     """
 
     def __init__(
@@ -57,6 +69,7 @@ class HttpReadResourceHandle(BaseResourceHandle[bytes]):
         *,
         timeout: tuple[float, float] | None = None,
         newline: AnyStr | None = None,
+        total_size: int = -1,
     ) -> None:
         super().__init__(mode, log, uri, newline=newline)
         self._url = uri.geturl()
@@ -66,16 +79,31 @@ class HttpReadResourceHandle(BaseResourceHandle[bytes]):
             raise ValueError("timeout must be specified when constructing this object")
         self._timeout = timeout
 
-        self._completeBuffer: io.BytesIO | None = None
+        # Writing is not supported but the mode can still ask for it.
+        self._write_requested = bool({"w", "x", "a", "+"} & set(mode))
+
+        # The contents of the whole file, if they have been retrieved.
+        self._completeBuffer: bytes | None = None
+
+        # The bytes returned by the most recent range request and the offset
+        # of the first of them in the file. These are kept so that reads
+        # following a short seek can be served without contacting the server.
+        self._last_chunk: bytes | None = None
+        self._last_chunk_start = 0
+
+        # Minimum number of bytes requested by a range read. Fetching ahead
+        # of small reads means a sequential scan needs far fewer round trips.
+        self._prefetch_size = 1 << 20
 
         self._closed = CloseStatus.OPEN
         self._current_position = 0
         self._eof = False
-        self._total_size = -1  # Unknown
+        self._total_size = total_size  # -1 if unknown
 
     def close(self) -> None:
         self._closed = CloseStatus.CLOSED
         self._completeBuffer = None
+        self._last_chunk = None
         self._eof = True
 
     @property
@@ -86,8 +114,7 @@ class HttpReadResourceHandle(BaseResourceHandle[bytes]):
         raise io.UnsupportedOperation("HttpReadResourceHandle does not have a file number")
 
     def flush(self) -> None:
-        modes = set(self._mode)
-        if {"w", "x", "a", "+"} & modes:
+        if self._write_requested:
             raise io.UnsupportedOperation("HttpReadResourceHandles are read only")
 
     @property
@@ -118,10 +145,6 @@ class HttpReadResourceHandle(BaseResourceHandle[bytes]):
             self._current_position = self._size() + offset
         else:
             raise io.UnsupportedOperation("Seek value is incorrect, or whence mode is unsupported")
-
-        # handle if the complete file has be read already
-        if self._completeBuffer is not None:
-            self._completeBuffer.seek(self._current_position, whence)
         return self._current_position
 
     def seekable(self) -> bool:
@@ -142,29 +165,104 @@ class HttpReadResourceHandle(BaseResourceHandle[bytes]):
     def writelines(self, b: Iterable[bytes], /) -> None:
         raise io.UnsupportedOperation("HttpReadResourceHandles are read only")
 
+    def readinto(self, b: bytearray | memoryview, /) -> int:
+        view = memoryview(b).cast("B")
+        if self._completeBuffer is not None:
+            # Copy straight out of the file contents rather than through an
+            # intermediate bytes object.
+            start = self._current_position
+            data: bytes | memoryview = memoryview(self._completeBuffer)[start : start + len(view)]
+            self._current_position += len(data)
+        else:
+            data = self.read(len(view))
+        view[: len(data)] = data
+        return len(data)
+
+    def _read_from_complete_buffer(self, size: int) -> bytes:
+        """Read from the contents of the whole file.
+
+        Parameters
+        ----------
+        size : `int`
+            Number of bytes to read. A negative value means read to the end
+            of the file.
+
+        Returns
+        -------
+        result : `bytes`
+            The requested bytes.
+        """
+        assert self._completeBuffer is not None
+        start = self._current_position
+        result = self._completeBuffer[start : start + size] if size >= 0 else self._completeBuffer[start:]
+        self._current_position += len(result)
+        return result
+
+    def _read_from_last_chunk(self, size: int) -> bytes | None:
+        """Read from the bytes retrieved by the most recent range request.
+
+        Parameters
+        ----------
+        size : `int`
+            Number of bytes to read. A negative value means read to the end
+            of the file.
+
+        Returns
+        -------
+        result : `bytes` or `None`
+            The requested bytes or `None` if they are not all available
+            locally.
+        """
+        if self._last_chunk is None:
+            return None
+        chunk_size = len(self._last_chunk)
+        offset = self._current_position - self._last_chunk_start
+        if offset < 0 or offset > chunk_size:
+            return None
+
+        # If the chunk extends to the end of the file it can also satisfy
+        # reads asking for more bytes than are left.
+        at_eof = self._total_size != -1 and self._last_chunk_start + chunk_size >= self._total_size
+        if size >= 0 and offset + size <= chunk_size:
+            end = offset + size
+        elif at_eof:
+            end = chunk_size
+        else:
+            return None
+
+        result = self._last_chunk[offset:end]
+        self._current_position += len(result)
+        if at_eof and end == chunk_size:
+            self._eof = True
+        return result
+
     def read(self, size: int = -1) -> bytes:
-        if self._eof:
-            # At EOF so always return an empty byte string.
+        if self._eof or size == 0:
+            # At EOF or nothing requested so always return an empty byte
+            # string.
             return b""
 
         # branch for if the complete file has been read before
         if self._completeBuffer is not None:
-            result = self._completeBuffer.read(size)
-            self._current_position += len(result)
-            return result
+            return self._read_from_complete_buffer(size)
 
         if self._completeBuffer is None and size == -1 and self._current_position == 0:
             # The whole file has been requested, read it into a buffer and
             # return the result
-            self._completeBuffer = io.BytesIO()
             with time_this(self._log, msg="Read from remote resource %s", args=(self._url,)):
                 resp = self._session.get(self._url, stream=False, timeout=self._timeout)
             if (code := resp.status_code) not in (requests.codes.ok, requests.codes.partial):
                 raise FileNotFoundError(f"Unable to read resource {self._url}; status code: {code}")
-            self._completeBuffer.write(resp.content)
-            self._current_position = self._completeBuffer.tell()
-
-            return self._completeBuffer.getbuffer().tobytes()
+            # The response body is immutable so can be kept and returned
+            # without copying it.
+            self._completeBuffer = resp.content
+            self._current_position = len(resp.content)
+            return resp.content
+
+        # Readers often seek by small amounts, e.g. when parsing file
+        # headers, so check whether the data has been retrieved already.
+        if (result := self._read_from_last_chunk(size)) is not None:
+            return result
 
         # A partial read is required, either because a size has been specified,
         # or a read has previously been done. Any time we specify a byte range
@@ -174,7 +272,8 @@ class HttpReadResourceHandle(BaseResourceHandle[bytes]):
         # then that is at least confusing and also there is no guarantee that
         # the bytes can be uncompressed.
 
-        end_pos = self._current_position + (size - 1) if size >= 0 else ""
+        fetch_size = max(size, self._prefetch_size) if size >= 0 else -1
+        end_pos = self._current_position + (fetch_size - 1) if fetch_size >= 0 else ""
         headers = {"Range": f"bytes={self._current_position}-{end_pos}", "Accept-Encoding": "identity"}
 
         with time_this(
@@ -194,30 +293,42 @@ class HttpReadResourceHandle(BaseResourceHandle[bytes]):
                 f"Unable to read resource {self._url}, or bytes are out of range; status code: {code}"
             )
 
+        if code == requests.codes.ok:
+            # The server ignored the range and sent the whole file. Keep it
+            # so that subsequent reads do not download it all over again.
+            self._completeBuffer = resp.content
+            self._total_size = len(resp.content)
+            return self._read_from_complete_buffer(size)
+
         # The response header should tell us the total number of bytes
         # in the file and also the current position we have got to in the
         # server.
+        chunk_start = self._current_position
         if "Content-Range" in resp.headers:
             content_range = parse_content_range_header(resp.headers["Content-Range"])
+            if content_range.range_start is not None:
+                chunk_start = content_range.range_start
             if content_range.total is not None:
                 # Store in case we need this later.
                 self._total_size = content_range.total
-            if (
-                content_range.total is not None
-                and content_range.range_end is not None
-                and content_range.range_end >= content_range.total - 1
-            ):
-                self._eof = True
-
-        # Try to guess that we overran the end. This will not help if we
-        # read exactly the number of bytes to get us to the end and so we
-        # will need to do one more read and get a 416.
+
+        # A range running to the end of the file tells us the size if the
+        # header did not. A bounded range may be cut short by the server
+        # without the end of the file being reached, so it tells us nothing.
         len_content = len(resp.content)
-        if len_content < size:
-            self._eof = True
+        if self._total_size == -1 and fetch_size < 0:
+            self._total_size = chunk_start + len_content
 
-        self._current_position += len_content
-        return resp.content
+        # Only the requested bytes are returned, the rest are kept for the
+        # reads that follow.
+        self._last_chunk = resp.content
+        self._last_chunk_start = chunk_start
+        if (result := self._read_from_last_chunk(size)) is None:
+            # The server sent less than requested without reaching the end
+            # of the file so return whatever was received.
+            result = resp.content
+            self._current_position += len_content
+        return result
 
 
 class ContentRange(NamedTuple):
@@ -255,23 +366,14 @@ def parse_content_range_header(header: str) -> ContentRange:
     ValueError
         If the header was not in the expected format.
     """
-    # There are three possible formats for Content-Range. All of them start
-    # with optional whitespace and a unit, which for our purposes should always
-    # be "bytes".
-    prefix = r"^\s*bytes\s+"
-
-    # Content-Range: <unit> <range-start>-<range-end>/<size>
-    if (case1 := re.match(prefix + r"(\d+)-(\d+)/(\d+)", header)) is not None:
-        return ContentRange(
-            range_start=int(case1.group(1)), range_end=int(case1.group(2)), total=int(case1.group(3))
-        )
-
-    # Content-Range: <unit> <range-start>-<range-end>/*
-    if (case2 := re.match(prefix + r"(\d+)-(\d+)/\*", header)) is not None:
-        return ContentRange(range_start=int(case2.group(1)), range_end=int(case2.group(2)), total=None)
-
-    # Content-Range: <unit> */<size>
-    if (case3 := re.match(prefix + r"\*/(\d+)", header)) is not None:
-        return ContentRange(range_start=None, range_end=None, total=int(case3.group(1)))
-
-    raise ValueError(f"Content-Range header in unexpected format: '{header}'")
+    if (match := _CONTENT_RANGE_RE.match(header)) is None:
+        raise ValueError(f"Content-Range header in unexpected format: '{header}'")
+
+    range_start, range_end, total, unsatisfied_total = match.groups()
+    if range_start is None:
+        return ContentRange(range_start=None, range_end=None, total=int(unsatisfied_total))
+    return ContentRange(
+        range_start=int(range_start),
+        range_end=int(range_end),
+        total=int(total) if total is not None else None,
+    )
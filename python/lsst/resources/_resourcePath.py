@@ -15,7 +15,8 @@ __all__ = ("ResourcePath", "ResourcePathExpression")
 
 import concurrent.futures
 import contextlib
-import copy
+import functools
+import importlib
 import io
 import locale
 import logging
@@ -39,7 +40,7 @@ from collections.abc import Iterable, Iterator
 from typing import TYPE_CHECKING, Any, Literal, overload
 
 from ._resourceHandles._baseResourceHandle import ResourceHandleProtocol
-from .utils import ensure_directory_is_writeable
+from .utils import ensure_directory_is_writeable, quote_path
 
 if TYPE_CHECKING:
     from .utils import TransactionProtocol
@@ -50,6 +51,21 @@ log = logging.getLogger(__name__)
 # Regex for looking for URI escapes
 ESCAPES_RE = re.compile(r"%[A-F0-9]{2}")
 
+# Regex splitting an absolute URI into scheme, netloc, path, query and
+# fragment (see RFC 3986 appendix B). It is restricted to the URIs that
+# urllib.parse.urlparse splits without any special handling so URIs with
+# params, IPv6 hosts, upper case schemes, whitespace or control characters
+# do not match.
+URI_COMPONENTS_RE = re.compile(
+    r"([a-z][a-z0-9+.-]*)://([^/?#\[\]\x00-\x20]*)((?:/[^?#;\x00-\x20]*)?)"
+    r"(?:\?([^#\x00-\x20]*))?(?:#([^\x00-\x20]*))?"
+)
+
+# Regex matching relative paths that the constructor would leave unchanged,
+# apart from normalization. Such a path has no scheme, fragment, query,
+# escapes, or anything that would be expanded.
+SIMPLE_RELATIVE_PATH_RE = re.compile(r"[^/~$%#?;:][^$%#?;:]*")
+
 # Precomputed escaped hash
 ESCAPED_HASH = urllib.parse.quote("#")
 
@@ -135,8 +151,14 @@ class ResourcePath:  # numpydoc ignore=PR02
     # are still abstract. If they are not marked abstract but just raise
     # mypy is fine with it.
 
+    # Very large numbers of these objects can be created so avoid a
+    # per-instance dict. Subclasses should declare any additional instance
+    # attributes in their own __slots__.
+    __slots__ = ("_uri", "_url", "dirLike", "isTemporary")
+
     # mypy is confused without these
     _uri: urllib.parse.ParseResult
+    _url: str | None
     isTemporary: bool
     dirLike: bool | None
     """Whether the resource looks like a directory resource. `None` means that
@@ -176,28 +198,21 @@ class ResourcePath:  # numpydoc ignore=PR02
             # Since sometimes people write file:/a/b and not file:///a/b
             # we should not quote in the explicit case of file:
             if "://" not in uri and not uri.startswith("file:"):
-                if ESCAPES_RE.search(uri):
+                quoted = _quote_path_string(uri)
+                if quoted is None:
                     log.warning("Possible double encoding of %s", uri)
                 else:
-                    # Fragments are generally not encoded so we must search
-                    # for the fragment boundary ourselves. This is making
-                    # an assumption that the filename does not include a "#"
-                    # and also that there is no "/" in the fragment itself.
-                    to_encode = uri
-                    fragment = ""
-                    if "#" in uri:
-                        dirpos = uri.rfind("/")
-                        trailing = uri[dirpos + 1 :]
-                        hashpos = trailing.rfind("#")
-                        if hashpos != -1:
-                            fragment = trailing[hashpos:]
-                            to_encode = uri[: dirpos + hashpos + 1]
-
-                    uri = urllib.parse.quote(to_encode) + fragment
-
-            parsed = urllib.parse.urlparse(uri)
+                    uri = quoted
+
+                parsed = urllib.parse.urlparse(uri)
+            else:
+                # URIs with a scheme are parsed by a cached function since
+                # absolute URIs do not depend on the root or the current
+                # working directory.
+                subclass, parsed, dirLike = _parse_absolute_uri(uri, forceDirectory)
         elif isinstance(uri, urllib.parse.ParseResult):
-            parsed = copy.copy(uri)
+            # ParseResult is an immutable tuple so it can be used directly.
+            parsed = uri
             # If we are being instantiated with a subclass, rather than
             # ResourcePath, ensure that that subclass is used directly.
             # This could lead to inconsistencies if this constructor
@@ -284,36 +299,8 @@ class ResourcePath:  # numpydoc ignore=PR02
                     from .schemeless import SchemelessResourcePath
 
                     subclass = SchemelessResourcePath
-            elif parsed.scheme == "file":
-                from .file import FileResourcePath
-
-                subclass = FileResourcePath
-            elif parsed.scheme == "s3":
-                from .s3 import S3ResourcePath
-
-                subclass = S3ResourcePath
-            elif parsed.scheme.startswith("http"):
-                from .http import HttpResourcePath
-
-                subclass = HttpResourcePath
-            elif parsed.scheme == "gs":
-                from .gs import GSResourcePath
-
-                subclass = GSResourcePath
-            elif parsed.scheme == "resource":
-                # Rules for scheme names disallow pkg_resource
-                from .packageresource import PackageResourcePath
-
-                subclass = PackageResourcePath
-            elif parsed.scheme == "mem":
-                # in-memory datastore object
-                from .mem import InMemoryResourcePath
-
-                subclass = InMemoryResourcePath
             else:
-                raise NotImplementedError(
-                    f"No URI support for scheme: '{parsed.scheme}' in {parsed.geturl()}"
-                )
+                subclass = _find_subclass(parsed)
 
             parsed, dirLike = subclass._fixupPathUri(
                 parsed, root=root_uri, forceAbsolute=forceAbsolute, forceDirectory=forceDirectory
@@ -328,11 +315,35 @@ class ResourcePath:  # numpydoc ignore=PR02
 
         # Now create an instance of the correct subclass and set the
         # attributes directly
-        self = object.__new__(subclass)
-        self._uri = parsed
-        self.dirLike = dirLike
         if isTemporary is None:
             isTemporary = False
+        return subclass._from_parsed(parsed, dirLike, isTemporary)
+
+    @classmethod
+    def _from_parsed(
+        cls, parsed: urllib.parse.ParseResult, dirLike: bool | None, isTemporary: bool = False
+    ) -> ResourcePath:
+        """Create an instance of this class from an already fixed up URI.
+
+        Parameters
+        ----------
+        parsed : `~urllib.parse.ParseResult`
+            The parsed URI. Must already be in the form that the constructor
+            would create for this class since no checks are made.
+        dirLike : `bool` or `None`
+            Whether the URI refers to a directory.
+        isTemporary : `bool`, optional
+            Whether the URI refers to a temporary resource.
+
+        Returns
+        -------
+        uri : `ResourcePath`
+            New instance of this class.
+        """
+        self = object.__new__(cls)
+        self._uri = parsed
+        self._url = None
+        self.dirLike = dirLike
         self.isTemporary = isTemporary
         return self
 
@@ -386,10 +397,10 @@ class ResourcePath:  # numpydoc ignore=PR02
 
         This means that the path components refers to the top level.
         """
-        relpath = self.relativeToPathRoot
-        if relpath == "./":
-            return True
-        return False
+        # Equivalent to checking relativeToPathRoot but avoids the extra
+        # work in the common case of a path below the root.
+        relToRoot = self.path.lstrip("/")
+        return not relToRoot or urllib.parse.unquote(relToRoot) == "./"
 
     @property
     def fragment(self) -> str:
@@ -419,7 +430,11 @@ class ResourcePath:  # numpydoc ignore=PR02
         url : `str`
             String form of URI.
         """
-        return self._uri.geturl()
+        # The string form is needed often, e.g. for hashing, and can not
+        # change so only create it once.
+        if self._url is None:
+            self._url = self._uri.geturl()
+        return self._url
 
     def to_fsspec(self) -> tuple[AbstractFileSystem, str]:
         """Return an abstract file system and path that can be used by fsspec.
@@ -479,6 +494,12 @@ class ResourcePath:  # numpydoc ignore=PR02
         # The file part should never include quoted metacharacters
         tail = urllib.parse.unquote(tail)
 
+        if self.scheme and head.startswith("/"):
+            # An absolute path with a scheme only needs the trailing
+            # separator to be added so the constructor can be bypassed.
+            headuri, dirLike = self._fixDirectorySep(headuri, forceDirectory=True)
+            return self._from_parsed(headuri, dirLike), tail
+
         # Schemeless is special in that it can be a relative path.
         # We need to ensure that it stays that way. All other URIs will
         # be absolute already.
@@ -501,7 +522,10 @@ class ResourcePath:  # numpydoc ignore=PR02
 
         Equivalent of `os.path.basename`.
         """
-        return self.split()[1]
+        if self.isdir():
+            return ""
+        # Avoid split() since the head is not needed.
+        return urllib.parse.unquote(self._pathModule.basename(self.path))
 
     def dirname(self) -> ResourcePath:
         """Return the directory component of the path as a new `ResourcePath`.
@@ -541,10 +565,18 @@ class ResourcePath:  # numpydoc ignore=PR02
             # os.path.split() is slightly faster than calling Path().parent.
             return self.dirname()
         # When self is dir-like, returns its parent directory,
-        # regardless of the presence of a trailing separator
-        originalPath = self._pathLib(self.path)
-        parentPath = originalPath.parent
-        return self.replace(path=str(parentPath), forceDirectory=True)
+        # regardless of the presence of a trailing separator.
+        pathModule = self._pathModule
+        sep = pathModule.sep
+        path = self.path.rstrip(sep)
+        if not path or sep + sep in path or f"{sep}.{sep}" in f"{sep}{path}{sep}":
+            # The root, or a path that is not normalized, so let the path
+            # library deal with any redundant components.
+            parentPath = str(self._pathLib(self.path).parent)
+        else:
+            # dirname() is much faster than creating a PurePath.
+            parentPath = pathModule.dirname(path) or pathModule.curdir
+        return self.replace(path=parentPath, forceDirectory=True)
 
     def replace(
         self, forceDirectory: bool | None = None, isTemporary: bool = False, **kwargs: Any
@@ -663,26 +695,23 @@ class ResourcePath:  # numpydoc ignore=PR02
         a suffix. An extension is only determined from the final component
         of the path.
         """
-        special = {".gz", ".bz2", ".xz", ".fz"}
-
         # path lib will ignore any "." in directories.
         # path lib works well:
         # extensions = self._pathLib(self.path).suffixes
-        # But the constructor is slow. Therefore write our own implementation.
+        # But the constructor is slow. Therefore write our own implementation
+        # that only searches backwards from the end of the path.
         # Strip trailing separator if present, do not care if this is a
         # directory or not.
-        parts = self.path.rstrip("/").rsplit(self._pathModule.sep, 1)
-        _, *extensions = parts[-1].split(".")
-
-        if not extensions:
+        path = self.path.rstrip("/")
+        start = path.rfind(self._pathModule.sep) + 1
+        dot = path.rfind(".", start)
+        if dot == -1:
             return ""
-        extensions = ["." + x for x in extensions]
-
-        ext = extensions.pop()
+        ext = path[dot:]
 
         # Multiple extensions, decide whether to include the final two
-        if extensions and ext in special:
-            ext = f"{extensions[-1]}{ext}"
+        if ext in {".gz", ".bz2", ".xz", ".fz"} and (previous := path.rfind(".", start, dot)) != -1:
+            ext = path[previous:]
 
         return ext
 
@@ -748,48 +777,65 @@ class ResourcePath:  # numpydoc ignore=PR02
             isTemporary = self.isTemporary
         elif not isTemporary and self.isTemporary:
             raise RuntimeError("Cannot join temporary URI to non-temporary URI.")
-        # If we have a full URI in path we will use it directly
-        # but without forcing to absolute so that we can trap the
-        # expected option of relative path.
-        path_uri = ResourcePath(
-            path, forceAbsolute=False, forceDirectory=forceDirectory, isTemporary=isTemporary
-        )
-        if forceDirectory is not None and path_uri.dirLike is not forceDirectory:
-            raise ValueError(
-                "The supplied path URI to join has inconsistent directory state "
-                f"with forceDirectory parameter: {path_uri.dirLike} vs {forceDirectory}"
+        if isinstance(path, str) and SIMPLE_RELATIVE_PATH_RE.fullmatch(path):
+            # A plain relative path would only be normalized by the
+            # constructor so there is no need to create a ResourcePath for
+            # it. Only the directory status has to be determined.
+            fragment = ""
+            if path.endswith(os.sep):
+                if forceDirectory is False:
+                    raise ValueError(
+                        f"URI {path} ends with {os.sep} but "
+                        "forceDirectory parameter declares it to be a file."
+                    )
+                forceDirectory = True
+        else:
+            # If we have a full URI in path we will use it directly
+            # but without forcing to absolute so that we can trap the
+            # expected option of relative path.
+            path_uri = ResourcePath(
+                path, forceAbsolute=False, forceDirectory=forceDirectory, isTemporary=isTemporary
             )
-        forceDirectory = path_uri.dirLike
+            if forceDirectory is not None and path_uri.dirLike is not forceDirectory:
+                raise ValueError(
+                    "The supplied path URI to join has inconsistent directory state "
+                    f"with forceDirectory parameter: {path_uri.dirLike} vs {forceDirectory}"
+                )
+            forceDirectory = path_uri.dirLike
 
-        if path_uri.isabs():
-            # Absolute URI so return it directly.
-            return path_uri
+            if path_uri.isabs():
+                # Absolute URI so return it directly.
+                return path_uri
 
-        # We want to propagate fragments to the joined path and we rely on
-        # the ResourcePath parser to find these fragments for us even in plain
-        # strings. Must assume there are no `#` characters in filenames.
-        if not isinstance(path, str) or path_uri.fragment:
-            path = path_uri.unquoted_path
+            # We want to propagate fragments to the joined path and we rely on
+            # the ResourcePath parser to find these fragments for us even in
+            # plain strings. Must assume there are no `#` characters in
+            # filenames.
+            fragment = path_uri.fragment
+            if not isinstance(path, str) or fragment:
+                path = path_uri.unquoted_path
 
         # Might need to quote the path.
         if self.quotePaths:
-            path = urllib.parse.quote(path)
+            path = quote_path(path)
 
-        newpath = self._pathModule.normpath(self._pathModule.join(self.path, path))
+        pathModule = self._pathModule
+        newpath = pathModule.normpath(pathModule.join(self.path, path))
 
         # normpath can strip trailing / so we force directory if the supplied
         # path ended with a /
-        has_dir_sep = path.endswith(self._pathModule.sep)
+        has_dir_sep = path.endswith(pathModule.sep)
         if forceDirectory is None and has_dir_sep:
             forceDirectory = True
         elif forceDirectory is False and has_dir_sep:
             raise ValueError("Path to join has trailing / but is being forced to be a file.")
-        return self.replace(
-            path=newpath,
-            forceDirectory=forceDirectory,
-            isTemporary=isTemporary,
-            fragment=path_uri.fragment,
+        # This is what replace() would do, but the class is already known so
+        # there is no need to go through the constructor. Listing a
+        # directory can result in many joins.
+        parsed, dirLike = self._fixDirectorySep(
+            self._uri._replace(path=newpath, fragment=fragment), forceDirectory
         )
+        return self._from_parsed(parsed, dirLike, isTemporary)
 
     def relative_to(self, other: ResourcePath) -> str | None:
         """Return the relative path from this URI to the other URI.
@@ -817,16 +863,25 @@ class ResourcePath:  # numpydoc ignore=PR02
             if not {self.netloc, other.netloc}.issubset(local_netlocs):
                 return None
 
-        enclosed_path = self._pathLib(self.relativeToPathRoot)
+        enclosed_path = self.relativeToPathRoot
         parent_path = other.relativeToPathRoot
         subpath: str | None
-        try:
-            subpath = str(enclosed_path.relative_to(parent_path))
-        except ValueError:
-            subpath = None
+        if self._pathModule is posixpath:
+            # Compare the path components directly rather than creating
+            # PurePosixPath objects. Empty and "." components are ignored
+            # in the same way as the path library would.
+            enclosed_parts = [part for part in enclosed_path.split("/") if part and part != "."]
+            parent_parts = [part for part in parent_path.split("/") if part and part != "."]
+            n_parent = len(parent_parts)
+            if enclosed_parts[:n_parent] != parent_parts:
+                return None
+            subpath = "/".join(enclosed_parts[n_parent:]) or "."
         else:
-            subpath = urllib.parse.unquote(subpath)
-        return subpath
+            try:
+                subpath = str(self._pathLib(enclosed_path).relative_to(parent_path))
+            except ValueError:
+                return None
+        return urllib.parse.unquote(subpath)
 
     def exists(self) -> bool:
         """Indicate that the resource is available.
@@ -1106,6 +1161,10 @@ class ResourcePath:  # numpydoc ignore=PR02
         """Compare supplied object with this `ResourcePath`."""
         if not isinstance(other, ResourcePath):
             return NotImplemented
+        # Identical components always result in the same URL so the tuple
+        # comparison avoids serializing both URIs in the common case.
+        if self._uri == other._uri:
+            return True
         return self.geturl() == other.geturl()
 
     def __hash__(self) -> int:
@@ -1551,6 +1610,177 @@ class ResourcePath:  # numpydoc ignore=PR02
         raise NotImplementedError(f"URL signing is not supported for '{self.scheme}'")
 
 
+# Module and name of the class implementing each supported URI scheme.
+# Modules are only imported when a URI using the scheme is first seen.
+_SCHEME_IMPLEMENTATIONS: dict[str, tuple[str, str]] = {
+    "file": (".file", "FileResourcePath"),
+    "s3": (".s3", "S3ResourcePath"),
+    "http": (".http", "HttpResourcePath"),
+    "https": (".http", "HttpResourcePath"),
+    "gs": (".gs", "GSResourcePath"),
+    # Rules for scheme names disallow pkg_resource
+    "resource": (".packageresource", "PackageResourcePath"),
+    # in-memory datastore object
+    "mem": (".mem", "InMemoryResourcePath"),
+}
+
+
+@functools.cache
+def _import_subclass(module_name: str, class_name: str) -> type[ResourcePath]:
+    """Import and return a `ResourcePath` subclass.
+
+    Parameters
+    ----------
+    module_name : `str`
+        Name of the module, relative to this package.
+    class_name : `str`
+        Name of the class within the module.
+
+    Returns
+    -------
+    subclass : `type` [`ResourcePath`]
+        The imported class.
+    """
+    module = importlib.import_module(module_name, package=__package__)
+    return getattr(module, class_name)
+
+
+def _find_subclass(parsed: urllib.parse.ParseResult) -> type[ResourcePath]:
+    """Return the `ResourcePath` subclass implementing the scheme of a URI.
+
+    Parameters
+    ----------
+    parsed : `~urllib.parse.ParseResult`
+        The parsed URI. Must have a scheme.
+
+    Returns
+    -------
+    subclass : `type` [`ResourcePath`]
+        The class to use for this URI.
+
+    Raises
+    ------
+    NotImplementedError
+        Raised if the URI scheme is not supported.
+    """
+    try:
+        module_name, class_name = _SCHEME_IMPLEMENTATIONS[parsed.scheme]
+    except KeyError:
+        raise NotImplementedError(
+            f"No URI support for scheme: '{parsed.scheme}' in {parsed.geturl()}"
+        ) from None
+    return _import_subclass(module_name, class_name)
+
+
+@functools.lru_cache(maxsize=4096)
+def _parse_absolute_uri(
+    uri: str, forceDirectory: bool | None
+) -> tuple[type[ResourcePath] | None, urllib.parse.ParseResult, bool | None]:
+    """Parse a URI string that includes a scheme.
+
+    Parameters
+    ----------
+    uri : `str`
+        URI to parse. Must be already quoted.
+    forceDirectory : `bool` or `None`
+        Whether the URI should be forced to refer to a directory.
+
+    Returns
+    -------
+    subclass : `type` [`ResourcePath`] or `None`
+        Class to use for this URI. `None` if the URI refers to a relative
+        path and so still has to be processed in the context of a root or
+        the current working directory.
+    parsed : `~urllib.parse.ParseResult`
+        The parsed URI. Has been fixed up if ``subclass`` is not `None`.
+    dirLike : `bool` or `None`
+        Whether the URI refers to a directory.
+
+    Notes
+    -----
+    Datastores create the same URIs again and again so the results are
+    cached. This is only possible because ``_fixupPathUri`` does not depend
+    on anything other than its arguments for absolute URIs. The cached
+    `~urllib.parse.ParseResult` is immutable and so can be shared by
+    multiple `ResourcePath` instances.
+    """
+    parsed = _urlparse(uri)
+    if not parsed.scheme or (parsed.scheme == "file" and not parsed.path.startswith("/")):
+        return None, parsed, forceDirectory
+    subclass = _find_subclass(parsed)
+    parsed, dirLike = subclass._fixupPathUri(parsed, forceDirectory=forceDirectory)
+    return subclass, parsed, dirLike
+
+
+def _urlparse(uri: str) -> urllib.parse.ParseResult:
+    """Parse a URI string.
+
+    Parameters
+    ----------
+    uri : `str`
+        URI to parse.
+
+    Returns
+    -------
+    parsed : `~urllib.parse.ParseResult`
+        The parsed URI. Identical to the result of `urllib.parse.urlparse`.
+
+    Notes
+    -----
+    Most URIs seen by datastores are simple enough to be split by a single
+    regular expression, which is much faster than `urllib.parse.urlparse`
+    for URIs that have not been seen before. Anything else is handed to
+    `urllib`.
+    """
+    if uri.isascii() and (match := URI_COMPONENTS_RE.fullmatch(uri)) is not None:
+        scheme, netloc, path, query, fragment = match.groups("")
+        return urllib.parse.ParseResult(scheme, netloc, path, "", query, fragment)
+    return urllib.parse.urlparse(uri)
+
+
+@functools.lru_cache(maxsize=4096)
+def _quote_path_string(uri: str) -> str | None:
+    """Quote a path string that has no URI scheme.
+
+    Parameters
+    ----------
+    uri : `str`
+        Path string, possibly with a trailing fragment.
+
+    Returns
+    -------
+    quoted : `str` or `None`
+        The quoted path with any fragment appended unquoted. `None` is
+        returned if the path looks like it has already been quoted.
+
+    Notes
+    -----
+    The result only depends on the string itself so it can be cached.
+    Any warning about double encoding is left to the caller so that it
+    is reported on every use.
+    """
+    # Checking for "%" first is much cheaper than running the
+    # regex and almost all paths will not contain one.
+    if "%" in uri and ESCAPES_RE.search(uri):
+        return None
+
+    # Fragments are generally not encoded so we must search
+    # for the fragment boundary ourselves. This is making
+    # an assumption that the filename does not include a "#"
+    # and also that there is no "/" in the fragment itself.
+    to_encode = uri
+    fragment = ""
+    if "#" in uri:
+        dirpos = uri.rfind("/")
+        trailing = uri[dirpos + 1 :]
+        hashpos = trailing.rfind("#")
+        if hashpos != -1:
+            fragment = trailing[hashpos:]
+            to_encode = uri[: dirpos + hashpos + 1]
+
+    return quote_path(to_encode) + fragment
+
+
 ResourcePathExpression = str | urllib.parse.ParseResult | ResourcePath | Path
 """Type-annotation alias for objects that can be coerced to ResourcePath.
 """
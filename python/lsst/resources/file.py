@@ -14,7 +14,6 @@ from __future__ import annotations
 __all__ = ("FileResourcePath",)
 
 import contextlib
-import copy
 import logging
 import os
 import os.path
@@ -46,6 +45,8 @@ log = logging.getLogger(__name__)
 class FileResourcePath(ResourcePath):
     """Path for explicit ``file`` URI scheme."""
 
+    __slots__ = ()
+
     transferModes = ("copy", "link", "symlink", "hardlink", "relsymlink", "auto", "move")
     transferDefault: str = "link"
 
@@ -449,7 +450,7 @@ class FileResourcePath(ResourcePath):
                 if not parsed.path.endswith(sep):
                     parsed = parsed._replace(path=parsed.path + sep)
                 dirLike = True
-            return copy.copy(parsed), dirLike
+            return parsed, dirLike
 
         # Relative path so must fix it to be compliant with the standard
 
@@ -123,6 +123,9 @@ def _get_client() -> storage.Client:
 class GSResourcePath(ResourcePath):
     """Access Google Cloud Storage resources."""
 
+    # No __slots__ are declared since the bucket and blob are cached on
+    # the instance using class defaults.
+
     _bucket: storage.Bucket | None = None
     _blob: storage.Blob | None = None
     _client: storage.Client | None = None
@@ -13,6 +13,7 @@ from __future__ import annotations
 
 __all__ = ("HttpResourcePath",)
 
+import concurrent.futures
 import contextlib
 import enum
 import functools
@@ -27,7 +28,8 @@ import re
 import ssl
 import stat
 import tempfile
-from collections.abc import Iterator
+import time
+from collections.abc import Iterable, Iterator
 from typing import TYPE_CHECKING, Any, BinaryIO, cast
 
 try:
@@ -47,7 +49,7 @@ except ImportError:
     AbstractFileSystem = type
     HTTPFileSystem = type
 
-from urllib.parse import parse_qs
+from urllib.parse import parse_qs, unquote, urlparse
 
 import requests
 from astropy import units as u
@@ -58,13 +60,46 @@ from urllib3.util.retry import Retry
 
 from ._resourceHandles import ResourceHandleProtocol
 from ._resourceHandles._httpResourceHandle import HttpReadResourceHandle, parse_content_range_header
-from ._resourcePath import ResourcePath
+from ._resourcePath import MAX_WORKERS, ResourcePath
 
 if TYPE_CHECKING:
     from .utils import TransactionProtocol
 
 log = logging.getLogger(__name__)
 
+# Matches compliance class "1" in the comma-separated value of a "DAV"
+# header.
+_DAV_CLASS_1_RE = re.compile(r"(?:^|,) *1 *(?:,|$)")
+
+# Bodies of PROPFIND requests asking only for the DAV live properties we are
+# interested in. 'resourcetype' and 'getcontentlength' tell whether a resource
+# exists, whether it is a directory and its size. 'displayname' is only needed
+# when listing the contents of a directory.
+_PROPFIND_BODY = (
+    """<?xml version="1.0" encoding="utf-8" ?>"""
+    """<D:propfind xmlns:D="DAV:"><D:prop>"""
+    """<D:resourcetype/><D:getcontentlength/>"""
+    """</D:prop></D:propfind>"""
+)
+_PROPFIND_LISTING_BODY = (
+    """<?xml version="1.0" encoding="utf-8" ?>"""
+    """<D:propfind xmlns:D="DAV:"><D:prop>"""
+    """<D:resourcetype/><D:getcontentlength/><D:displayname/>"""
+    """</D:prop></D:propfind>"""
+)
+
+# Qualified names of the elements of a PROPFIND response body.
+_DAV_RESPONSE = "{DAV:}response"
+_DAV_HREF = "{DAV:}href"
+_DAV_PROPSTAT = "{DAV:}propstat"
+_DAV_STATUS = "{DAV:}status"
+_DAV_PROP = "{DAV:}prop"
+_DAV_RESOURCETYPE = "{DAV:}resourcetype"
+_DAV_COLLECTION = "{DAV:}collection"
+_DAV_GETCONTENTLENGTH = "{DAV:}getcontentlength"
+_DAV_GETLASTMODIFIED = "{DAV:}getlastmodified"
+_DAV_DISPLAYNAME = "{DAV:}displayname"
+
 
 def _timeout_from_environment(env_var: str, default_value: float) -> float:
     """Convert and return a timeout from the value of an environment variable
@@ -118,13 +153,14 @@ class HttpResourcePathConfig:
     DEFAULT_BACKEND_PERSISTENT_CONNECTIONS: int = 1
 
     # Accepted digest algorithms
-    ACCEPTED_DIGESTS: list[str] = ["adler32", "md5", "sha-256", "sha-512"]
+    ACCEPTED_DIGESTS: frozenset[str] = frozenset(["adler32", "md5", "sha-256", "sha-512"])
 
     def __init__(self) -> None:
         self._front_end_connections: int | None = None
         self._back_end_connections: int | None = None
         self._digest_algorithm: str | None = None
         self._send_expect_on_put: bool | None = None
+        self._min_files_for_listing: int | None = None
         self._fsspec_is_enabled: bool | None = None
         self._timeout: tuple[float, float] | None = None
         self._collect_memory_usage: bool | None = None
@@ -207,6 +243,28 @@ class HttpResourcePathConfig:
         self._send_expect_on_put = "LSST_HTTP_PUT_SEND_EXPECT_HEADER" in os.environ
         return self._send_expect_on_put
 
+    @property
+    def min_files_for_listing(self) -> int:
+        """Minimum number of files in the same directory for `mexists` to
+        check their existence by listing that directory.
+
+        The value is read from the environment variable
+        `LSST_HTTP_MEXISTS_MIN_FILES_FOR_LISTING`. Listing a directory costs
+        a single request but its response grows with the number of entries
+        in the directory, so this is disabled (value 0) by default.
+        """
+        if self._min_files_for_listing is not None:
+            return self._min_files_for_listing
+
+        try:
+            self._min_files_for_listing = max(
+                0, int(os.environ.get("LSST_HTTP_MEXISTS_MIN_FILES_FOR_LISTING", 0))
+            )
+        except ValueError:
+            self._min_files_for_listing = 0
+
+        return self._min_files_for_listing
+
     @property
     def fsspec_is_enabled(self) -> bool:
         """Return True if `fsspec` is enabled for objects of class
@@ -423,20 +481,20 @@ def _get_dav_and_server_headers(path: ResourcePath | str) -> tuple[str | None, s
         if not isinstance(path, HttpResourcePath):
             path = HttpResourcePath(path)
 
-        config = HttpResourcePathConfig()
-        with SessionStore(config=config).get(path) as session:
-            resp = session.options(
-                str(path),
-                stream=False,
-                timeout=config.timeout,
-            )
+        # Use the shared metadata session so that the connection established
+        # for this request is reused by the requests which follow.
+        resp = path.metadata_session.options(
+            str(path),
+            stream=False,
+            timeout=path._config.timeout,
+        )
 
-            dav_header = server_header = None
-            if resp.status_code == requests.codes.ok:
-                dav_header = resp.headers.get("DAV") if "DAV" in resp.headers else None
-                server_header = resp.headers.get("Server") if "Server" in resp.headers else None
+        dav_header = server_header = None
+        if resp.status_code == requests.codes.ok:
+            dav_header = resp.headers.get("DAV") if "DAV" in resp.headers else None
+            server_header = resp.headers.get("Server") if "Server" in resp.headers else None
 
-            return (dav_header, server_header)
+        return (dav_header, server_header)
 
     except requests.exceptions.SSLError as e:
         log.warning(
@@ -458,9 +516,15 @@ class BearerTokenAuth(AuthBase):
         value of the token or the token itself.
     """
 
+    # Minimum interval between checks for modifications of the token file
+    # (seconds). Tokens are typically renewed every few minutes so there is
+    # no need to check before every single request.
+    _REFRESH_INTERVAL: float = 5.0
+
     def __init__(self, token: str):
         self._token = self._path = None
         self._mtime: float = -1.0
+        self._next_refresh: float = 0.0
         if not token:
             return
 
@@ -480,6 +544,10 @@ class BearerTokenAuth(AuthBase):
         if not self._path:
             return
 
+        if (now := time.monotonic()) < self._next_refresh:
+            return
+
+        self._next_refresh = now + self._REFRESH_INTERVAL
         if (mtime := os.stat(self._path).st_mtime) > self._mtime:
             log.debug("Reading bearer token file at %s", self._path)
             self._mtime = mtime
@@ -576,12 +644,13 @@ class SessionStore:
         Note that "https://www.example.org" and "https://www.example.org:12345"
         will have different sessions since the port number is not identical.
         """
-        root_uri = str(rpath.root_uri())
-        if root_uri not in self._sessions:
+        # This is str(rpath.root_uri()) without constructing a new URI.
+        root_uri = f"{rpath.scheme}://{rpath.netloc}/"
+        if (session := self._sessions.get(root_uri)) is None:
             # We don't have yet a session for this endpoint: create a new one.
-            self._sessions[root_uri] = self._make_session(rpath)
+            session = self._sessions[root_uri] = self._make_session(rpath)
 
-        return self._sessions[root_uri]
+        return session
 
     def _make_session(self, rpath: ResourcePath) -> requests.Session:
         """Make a new session configured from values from the environment."""
@@ -760,6 +829,10 @@ class HttpResourcePath(ResourcePath):
     # the response to a HTTP OPTIONS request.
     SUPPORTED_URL_SIGNERS = ("dcache", "xrootd")
 
+    # Sessions and server properties are cached on each instance when first
+    # needed.
+    __slots__ = ("_metadata_session", "_data_session", "_is_webdav", "_server")
+
     # Configuration items for this class instances.
     _config: HttpResourcePathConfig = HttpResourcePathConfig()
 
@@ -796,6 +869,10 @@ class HttpResourcePath(ResourcePath):
     # child process after a fork, to avoid confusing the SSL layer.
     _pid: int = -1
 
+    # ID of the current process. It is updated in the child after a fork so
+    # that the check above does not need to ask the system every time.
+    _current_pid: int = os.getpid()
+
     # Connector used by a session pool to establish network connections to
     # remote servers. This connector is exclusively used by fsspec file system
     # and is shared by all instances of this class.
@@ -807,7 +884,7 @@ class HttpResourcePath(ResourcePath):
         download of data, i.e. mostly metadata requests.
         """
         if hasattr(self, "_metadata_session"):
-            if HttpResourcePath._pid == os.getpid():
+            if HttpResourcePath._pid == HttpResourcePath._current_pid:
                 return self._metadata_session
             else:
                 # The metadata session we have in cache was likely created by
@@ -815,7 +892,7 @@ class HttpResourcePath(ResourcePath):
                 self._metadata_session_store.clear()
 
         # Retrieve a new metadata session.
-        HttpResourcePath._pid = os.getpid()
+        HttpResourcePath._pid = HttpResourcePath._current_pid
         self._metadata_session: requests.Session = self._metadata_session_store.get(self)
         return self._metadata_session
 
@@ -823,7 +900,7 @@ class HttpResourcePath(ResourcePath):
     def data_session(self) -> requests.Session:
         """Client session for uploading and downloading data."""
         if hasattr(self, "_data_session"):
-            if HttpResourcePath._pid == os.getpid():
+            if HttpResourcePath._pid == HttpResourcePath._current_pid:
                 return self._data_session
             else:
                 # The data session we have in cache was likely created by
@@ -831,7 +908,7 @@ class HttpResourcePath(ResourcePath):
                 self._data_session_store.clear()
 
         # Retrieve a new data session.
-        HttpResourcePath._pid = os.getpid()
+        HttpResourcePath._pid = HttpResourcePath._current_pid
         self._data_session: requests.Session = self._data_session_store.get(self)
         return self._data_session
 
@@ -856,8 +933,9 @@ class HttpResourcePath(ResourcePath):
         saving the results.
         """
         # Retrieve the "DAV" and the "Server" headers for the root URL of this
-        # path
-        dav_header, server_header = _get_dav_and_server_headers(self.root_uri())
+        # path. The string form of the root URL is used so that no new URI
+        # needs to be built when the headers for that server are cached.
+        dav_header, server_header = _get_dav_and_server_headers(f"{self.scheme}://{self.netloc}/")
 
         # Check that "1" is part of the value of the "DAV" header. We don't
         # use locks, so a server complying to class 1 is enough for our
@@ -872,7 +950,7 @@ class HttpResourcePath(ResourcePath):
         #   DAV: 1, <http://apache.org/dav/propset/fs/1>
         self._is_webdav: bool = False
         if dav_header is not None:
-            self._is_webdav = "1" in dav_header.replace(" ", "").split(",")
+            self._is_webdav = _DAV_CLASS_1_RE.search(dav_header) is not None
 
         self._server: str | None = None
         if server_header is not None:
@@ -925,6 +1003,111 @@ class HttpResourcePath(ResourcePath):
         """
         HttpResourcePath._config = HttpResourcePathConfig()
 
+    @classmethod
+    def _mexists(cls, uris: Iterable[ResourcePath]) -> dict[ResourcePath, bool]:
+        """Check for existence of multiple URIs at once.
+
+        Parameters
+        ----------
+        uris : iterable of `ResourcePath`
+            The URIs to test.
+
+        Returns
+        -------
+        existence : `dict` of [`ResourcePath`, `bool`]
+            Mapping of original URI to boolean indicating existence.
+
+        Notes
+        -----
+        If `HttpResourcePathConfig.min_files_for_listing` is set, the
+        existence of that many files or more in the same directory is checked
+        with a single request listing the contents of that directory. Other
+        URIs, and files in directories which cannot be listed, are checked one
+        by one. All the requests are sent concurrently.
+        """
+        # Group the files by directory if they are to be checked by listing
+        # their directory.
+        min_files = cls._config.min_files_for_listing
+        by_parent: dict[ResourcePath, list[ResourcePath]] = {}
+        singles: list[ResourcePath] = []
+        for uri in uris:
+            if min_files > 0 and not uri.dirLike:
+                by_parent.setdefault(uri.parent(), []).append(uri)
+            else:
+                singles.append(uri)
+
+        listings: dict[ResourcePath, list[ResourcePath]] = {}
+        for parent, children in by_parent.items():
+            if len(children) >= min_files:
+                listings[parent] = children
+            else:
+                singles.extend(children)
+
+        results: dict[ResourcePath, bool] = {}
+        with concurrent.futures.ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+            listing_futures: dict[concurrent.futures.Future[set[str] | None], ResourcePath] = {
+                executor.submit(cast(HttpResourcePath, parent)._list_directory_paths): parent
+                for parent in listings
+            }
+            exists_futures: dict[concurrent.futures.Future[bool], ResourcePath] = {
+                executor.submit(uri.exists): uri for uri in singles
+            }
+
+            for listing_future in concurrent.futures.as_completed(listing_futures):
+                parent = listing_futures[listing_future]
+                children = listings[parent]
+                try:
+                    paths = listing_future.result()
+                except (requests.exceptions.RequestException, ValueError, eTree.ParseError) as e:
+                    log.warning("Could not list %s, checking its files one by one: %s", parent, e)
+                    log.debug("Listing of %s failed", parent, exc_info=True)
+                    paths = None
+
+                if paths is None:
+                    exists_futures.update({executor.submit(uri.exists): uri for uri in children})
+                else:
+                    for child in children:
+                        results[child] = unquote(child.path) in paths
+
+            for exists_future in concurrent.futures.as_completed(exists_futures):
+                uri = exists_futures[exists_future]
+                try:
+                    exists = exists_future.result()
+                except Exception:
+                    exists = False
+                results[uri] = exists
+
+        return results
+
+    def _list_directory_paths(self) -> set[str] | None:
+        """Return the paths of this directory and of its direct members.
+
+        Returns
+        -------
+        paths : `set` [`str`] or `None`
+            Unquoted paths, without trailing separator, of the resources
+            returned by a PROPFIND request of depth 1, or an empty set if this
+            directory does not exist. `None` is returned if the server does
+            not support webDAV or if the paths in its response cannot be
+            compared to this one.
+        """
+        if not self.is_webdav_endpoint:
+            return None
+
+        resp = self._propfind(depth="1")
+        if resp.status_code != requests.codes.multi_status:  # 404 Not Found
+            return set()
+
+        paths = {
+            unquote(urlparse(prop.href).path).rstrip("/") for prop in _parse_propfind_response_body(resp.text)
+        }
+
+        # The response includes the directory itself, unless the server
+        # reports paths that differ from ours, e.g. behind a proxy.
+        if unquote(self.path).rstrip("/") not in paths:
+            return None
+        return paths
+
     def exists(self) -> bool:
         """Check that a remote HTTP resource exists."""
         log.debug("Checking if resource exists: %s", self.geturl())
@@ -1072,7 +1255,10 @@ class HttpResourcePath(ResourcePath):
         if not self.dirLike:
             raise NotADirectoryError(f"Can not create a 'directory' for file-like URI {self}")
 
-        # Check if the target directory already exists.
+        url = self.geturl()
+
+        # Check if the target directory already exists, which is the most
+        # common case when writing several files to the same directory.
         resp = self._propfind()
         if resp.status_code == requests.codes.multi_status:  # 207
             prop = _parse_propfind_response_body(resp.text)[0]
@@ -1085,14 +1271,20 @@ class HttpResourcePath(ResourcePath):
                         f"Can not create a directory for {self} because a file already exists at that path"
                     )
 
-        # Target directory does not exist. Create it and its ancestors as
-        # needed. We need to test if parent URL is different from self URL,
-        # otherwise we could be stuck in a recursive loop
+        # The parent directory usually exists, so first try to create the
+        # directory straight away, which takes a single request.
+        log.debug("Creating new directory: %s", url)
+        if self._mkcol(missing_parent_ok=True):
+            return
+
+        # The parent directory is missing: create it and its ancestors as
+        # needed and try again. We need to test if parent URL is different
+        # from self URL, otherwise we could be stuck in a recursive loop
         # where self == parent.
-        if self.geturl() != self.parent().geturl():
-            self.parent().mkdir()
+        parent = self.parent()
+        if url != parent.geturl():
+            parent.mkdir()
 
-        log.debug("Creating new directory: %s", self.geturl())
         self._mkcol()
 
     def remove(self) -> None:
@@ -1112,19 +1304,16 @@ class HttpResourcePath(ResourcePath):
         # network connections to both the front end and back end servers are
         # closed after downloading the data.
         log.debug("Reading from remote resource: %s", self.geturl())
-        stream = size > 0
-        with self.data_session as session:
-            with time_this(log, msg="GET %s", args=(self,)):
-                resp = session.get(self.geturl(), stream=stream, timeout=self._config.timeout)
-
+        with self.data_session as session, time_this(log, msg="GET %s", args=(self,)):
+            resp = session.get(self.geturl(), stream=True, timeout=self._config.timeout)
             if resp.status_code != requests.codes.ok:  # 200
                 raise FileNotFoundError(
                     f"Unable to read resource {self}; status: {resp.status_code} {resp.reason}"
                 )
-            if not stream:
-                return resp.content
-            else:
-                return next(resp.iter_content(chunk_size=size))
+            if size > 0:
+                return next(resp.iter_content(chunk_size=size), b"")
+
+            return resp.content
 
     def write(self, data: bytes, overwrite: bool = True) -> None:
         """Write the supplied bytes to the new resource.
@@ -1249,15 +1438,71 @@ class HttpResourcePath(ResourcePath):
         if isinstance(file_filter, str):
             file_filter = re.compile(file_filter)
 
-        resp = self._propfind(depth="1")
-        if resp.status_code == requests.codes.multi_status:  # 207
+        # The listings of the next directories to walk are requested
+        # concurrently while the results are still yielded in the usual
+        # top-down order.
+        executor = concurrent.futures.ThreadPoolExecutor(max_workers=MAX_WORKERS)
+        try:
+            yield from self._walk(file_filter, executor)
+        finally:
+            # Don't wait for listings nobody will look at, e.g. if the caller
+            # stopped iterating.
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def _walk(
+        self,
+        file_filter: re.Pattern | None,
+        executor: concurrent.futures.Executor,
+    ) -> Iterator[tuple[ResourcePath, list[str], list[str]]]:
+        """Walk the directory tree below this directory.
+
+        Parameters
+        ----------
+        file_filter : `re.Pattern` or `None`
+            Regex to filter out files from the list before it is returned.
+        executor : `concurrent.futures.Executor`
+            Executor used to request the listings of the directories to walk.
+            At most ``MAX_WORKERS`` listings are requested ahead of time.
+
+        Yields
+        ------
+        dirpath : `ResourcePath`
+            Current directory being examined.
+        dirnames : `list` of `str`
+            Names of subdirectories within dirpath.
+        filenames : `list` of `str`
+            Names of all the files within dirpath.
+        """
+        # Directories still to walk, the next one last, and the pending
+        # listings of some of them.
+        stack: list[HttpResourcePath] = [self]
+        listings: dict[HttpResourcePath, concurrent.futures.Future[requests.Response]] = {}
+        while stack:
+            uri = stack.pop()
+            if (listing := listings.pop(uri, None)) is None:
+                listing = executor.submit(uri._propfind, body=_PROPFIND_LISTING_BODY, depth="1")
+
+            # Request the listings of the directories to walk next while
+            # waiting for this one.
+            for next_uri in reversed(stack[-MAX_WORKERS:]):
+                if len(listings) >= MAX_WORKERS:
+                    break
+                if next_uri not in listings:
+                    listings[next_uri] = executor.submit(
+                        next_uri._propfind, body=_PROPFIND_LISTING_BODY, depth="1"
+                    )
+
+            resp = listing.result()
+            if resp.status_code != requests.codes.multi_status:  # 207
+                continue
+
             files: list[str] = []
             dirs: list[str] = []
-
+            path = uri.path.rstrip("/")
             for prop in _parse_propfind_response_body(resp.text):
                 if prop.is_file:
                     files.append(prop.name)
-                elif not prop.href.rstrip("/").endswith(self.path.rstrip("/")):
+                elif not prop.href.rstrip("/").endswith(path):
                     # Only include the names of sub-directories not the name of
                     # the directory being walked.
                     dirs.append(prop.name)
@@ -1266,13 +1511,13 @@ class HttpResourcePath(ResourcePath):
                 files = [f for f in files if file_filter.search(f)]
 
             if not dirs and not files:
-                return
-            else:
-                yield type(self)(self, forceAbsolute=False, forceDirectory=True), dirs, files
+                continue
 
-            for dir in dirs:
-                new_uri = self.join(dir, forceDirectory=True)
-                yield from new_uri.walk(file_filter)
+            yield type(self)(uri, forceAbsolute=False, forceDirectory=True), dirs, files
+
+            # The caller may have modified the list of directories, e.g. to
+            # prevent walking some of them, so only look at it now.
+            stack.extend(cast(HttpResourcePath, uri.join(dir, forceDirectory=True)) for dir in reversed(dirs))
 
     def generate_presigned_get_url(self, *, expiration_time_seconds: int) -> str:
         """Return a pre-signed URL that can be used to retrieve this resource
@@ -1486,7 +1731,15 @@ class HttpResourcePath(ResourcePath):
         # to both the front end and back end servers are closed after the
         # download operation is finished.
         with self.data_session as session:
-            resp = session.get(self.geturl(), stream=True, timeout=self._config.timeout)
+            # Ask for the contents as stored: data files are usually already
+            # compressed, so there is little to gain from the server encoding
+            # them again, and the downloaded size can then be checked.
+            resp = session.get(
+                self.geturl(),
+                stream=True,
+                timeout=self._config.timeout,
+                headers={"Accept-Encoding": "identity"},
+            )
             if resp.status_code != requests.codes.ok:
                 raise FileNotFoundError(
                     f"Unable to download resource {self}; status: {resp.status_code} {resp.reason}"
@@ -1619,7 +1872,8 @@ class HttpResourcePath(ResourcePath):
         ----------
         body : `str`, optional
             The body of the PROPFIND request to send to the server. If
-            provided, it is expected to be a XML document.
+            provided, it is expected to be a XML document. By default only
+            the type and the size of the resource are requested.
         depth : `str`, optional
             The value of the 'Depth' header to include in the request.
 
@@ -1634,15 +1888,7 @@ class HttpResourcePath(ResourcePath):
         is different from "207 Multistatus" or "404 Not Found".
         """
         if body is None:
-            # Request only the DAV live properties we are explicitly interested
-            # in namely 'resourcetype', 'getcontentlength', 'getlastmodified'
-            # and 'displayname'.
-            body = (
-                """<?xml version="1.0" encoding="utf-8" ?>"""
-                """<D:propfind xmlns:D="DAV:"><D:prop>"""
-                """<D:resourcetype/><D:getcontentlength/><D:getlastmodified/><D:displayname/>"""
-                """</D:prop></D:propfind>"""
-            )
+            body = _PROPFIND_BODY
         headers = {
             "Depth": depth,
             "Content-Type": 'application/xml; charset="utf-8"',
@@ -1674,19 +1920,41 @@ class HttpResourcePath(ResourcePath):
             return self._head_non_webdav_url()
         return self._send_webdav_request("HEAD")
 
-    def _mkcol(self) -> None:
+    def _mkcol(self, missing_parent_ok: bool = False) -> bool:
         """Send a MKCOL webDAV request to create a collection. The collection
         may already exist.
+
+        Parameters
+        ----------
+        missing_parent_ok : `bool`, optional
+            If `True`, return `False` instead of raising when the server
+            responds "409 Conflict", which means the parent collection does
+            not exist.
+
+        Returns
+        -------
+        created : `bool`
+            `True` if the collection was created or already exists, `False`
+            if its parent is missing and ``missing_parent_ok`` is `True`.
+
+        Raises
+        ------
+        ValueError
+            Raised if the collection could not be created.
         """
         resp = self._send_webdav_request("MKCOL")
         if resp.status_code == requests.codes.created:  # 201
-            return
+            return True
 
         if resp.status_code == requests.codes.method_not_allowed:  # 405
             # The remote directory already exists
             log.debug("Can not create directory: %s may already exist: skipping.", self.geturl())
-        else:
-            raise ValueError(f"Can not create directory {self}, status: {resp.status_code} {resp.reason}")
+            return True
+
+        if missing_parent_ok and resp.status_code == requests.codes.conflict:  # 409
+            return False
+
+        raise ValueError(f"Can not create directory {self}, status: {resp.status_code} {resp.reason}")
 
     def _delete(self) -> None:
         """Send a DELETE webDAV request for this resource."""
@@ -1885,6 +2153,10 @@ class HttpResourcePath(ResourcePath):
                 )
                 if resp.is_redirect:
                     url = resp.headers["Location"]
+                elif resp.status_code in (requests.codes.unauthorized, requests.codes.forbidden):
+                    # The upload would be rejected in the same way: don't
+                    # send the data.
+                    raise ValueError(f"Can not write file {self}, status: {resp.status_code} {resp.reason}")
 
             # Upload the data to the final destination.
             log.debug("Uploading data to %s", url)
@@ -1941,7 +2213,14 @@ class HttpResourcePath(ResourcePath):
         accepts_range = resp.status_code == requests.codes.ok and resp.headers.get("Accept-Ranges") == "bytes"
         handle: ResourceHandleProtocol
         if mode in ("rb", "r") and accepts_range:
-            handle = HttpReadResourceHandle(mode, log, self, timeout=self._config.timeout)
+            # Pass on the size of the resource so that the handle does not
+            # need to ask for it again, e.g. to seek relative to the end.
+            total_size = -1
+            if "Content-Encoding" not in resp.headers:
+                total_size = int(resp.headers.get("Content-Length", -1))
+            handle = HttpReadResourceHandle(
+                mode, log, self, timeout=self._config.timeout, total_size=total_size
+            )
             if mode == "r":
                 # cast because the protocol is compatible, but does not have
                 # BytesIO in the inheritance tree
@@ -1953,6 +2232,14 @@ class HttpResourcePath(ResourcePath):
                 yield http_handle
 
 
+def _update_pid_after_fork() -> None:
+    """Record the ID of a child process created by a fork."""
+    HttpResourcePath._current_pid = os.getpid()
+
+
+os.register_at_fork(after_in_child=_update_pid_after_fork)
+
+
 def _dump_response(resp: requests.Response) -> None:
     """Log the contents of a HTTP or webDAV request and its response.
 
@@ -2057,10 +2344,8 @@ def _parse_propfind_response_body(body: str) -> list[DavProperty]:
     # </D:multistatus>
 
     # Scan all the 'response' elements and extract the relevant properties
-    responses = []
     multistatus = eTree.fromstring(body.strip())
-    for response in multistatus.findall("./{DAV:}response"):
-        responses.append(DavProperty(response))
+    responses = [DavProperty(response) for response in multistatus if response.tag == _DAV_RESPONSE]
 
     if responses:
         return responses
@@ -2079,10 +2364,37 @@ class DavProperty:
         The XML response defining the DAV property.
     """
 
+    # One instance is built per entry of a directory listing.
+    __slots__ = ("_href", "_displayname", "_collection", "_getlastmodified", "_getcontentlength")
+
     # Regular expression to compare against the 'status' element of a
     # PROPFIND response's 'propstat' element.
     _status_ok_rex = re.compile(r"^HTTP/.* 200 .*$", re.IGNORECASE)
 
+    @classmethod
+    def _is_status_ok(cls, text: str | None) -> bool:
+        """Return `True` if ``text`` is a status line for a 200 response.
+
+        Parameters
+        ----------
+        text : `str` or `None`
+            Text of the 'status' element of a 'propstat' element.
+
+        Returns
+        -------
+        ok : `bool`
+            `True` if the status is OK.
+        """
+        if text is None:
+            return False
+
+        # Status lines are almost always of the form "HTTP/1.1 200 OK" so
+        # check for that first and only use the regular expression for
+        # unusual ones, e.g. surrounded by whitespace in indented responses.
+        if text.startswith("HTTP/") and " 200 " in text:
+            return True
+        return cls._status_ok_rex.match(text.strip()) is not None
+
     def __init__(self, response: eTree.Element | None):
         self._href: str = ""
         self._displayname: str = ""
@@ -2094,50 +2406,68 @@ class DavProperty:
             self._parse(response)
 
     def _parse(self, response: eTree.Element) -> None:
+        # Visit the children of each element once, instead of searching the
+        # element for every property of interest: listings of large
+        # directories contain thousands of 'response' elements.
+        href: eTree.Element | None = None
+        for child in response:
+            if child.tag == _DAV_HREF:
+                if href is None:
+                    href = child
+            elif child.tag == _DAV_PROPSTAT:
+                self._parse_propstat(child)
+
         # Extract 'href'.
-        if (element := response.find("./{DAV:}href")) is not None:
-            # We need to use "str(element.text)"" instead of "element.text" to
-            # keep mypy happy.
-            self._href = str(element.text).strip()
+        if href is not None:
+            self._href = (href.text or "").strip()
         else:
             raise ValueError(
                 "Property 'href' expected but not found in PROPFIND response: "
                 f"{eTree.tostring(response, encoding='unicode')}"
             )
 
-        for propstat in response.findall("./{DAV:}propstat"):
-            # Only extract properties of interest with status OK.
-            status = propstat.find("./{DAV:}status")
-            if status is None or not self._status_ok_rex.match(str(status.text)):
-                continue
-
-            for prop in propstat.findall("./{DAV:}prop"):
-                # Parse "collection".
-                if (element := prop.find("./{DAV:}resourcetype/{DAV:}collection")) is not None:
-                    self._collection = True
-
-                # Parse "getlastmodified".
-                if (element := prop.find("./{DAV:}getlastmodified")) is not None:
-                    self._getlastmodified = str(element.text)
-
-                # Parse "getcontentlength".
-                if (element := prop.find("./{DAV:}getcontentlength")) is not None:
-                    self._getcontentlength = int(str(element.text))
-
-                # Parse "displayname".
-                if (element := prop.find("./{DAV:}displayname")) is not None:
-                    self._displayname = str(element.text)
-
         # Some webDAV servers don't include the 'displayname' property in the
         # response so try to infer it from the value of the 'href' property.
         # Depending on the server the href value may end with '/'.
         if not self._displayname:
-            self._displayname = os.path.basename(self._href.rstrip("/"))
+            self._displayname = self._href.rstrip("/").rpartition("/")[2]
 
         # Force a size of 0 for collections.
         if self._collection:
             self._getcontentlength = 0
 
+    def _parse_propstat(self, propstat: eTree.Element) -> None:
+        # The 'status' element usually follows the 'prop' elements.
+        status: eTree.Element | None = None
+        props: list[eTree.Element] = []
+        for child in propstat:
+            if child.tag == _DAV_PROP:
+                props.append(child)
+            elif child.tag == _DAV_STATUS and status is None:
+                status = child
+
+        # Only extract properties of interest with status OK.
+        if status is None or not self._is_status_ok(status.text):
+            return
+
+        for prop in props:
+            for element in prop:
+                tag = element.tag
+                if tag == _DAV_RESOURCETYPE:
+                    # Parse "collection".
+                    if any(child.tag == _DAV_COLLECTION for child in element):
+                        self._collection = True
+                elif tag == _DAV_GETCONTENTLENGTH:
+                    # Leave the size unknown if the element is empty.
+                    if text := element.text:
+                        self._getcontentlength = int(text)
+                elif tag == _DAV_DISPLAYNAME:
+                    # An empty element has no text: the name is then
+                    # inferred from the href below.
+                    self._displayname = element.text or ""
+                elif tag == _DAV_GETLASTMODIFIED:
+                    self._getlastmodified = element.text or ""
+
     @property
     def exists(self) -> bool:
         # It is either a directory or a file with length of at least zero
@@ -23,6 +23,8 @@ class InMemoryResourcePath(ResourcePath):
     is in memory.
     """
 
+    __slots__ = ()
+
     def exists(self) -> bool:
         """Test for existence and always return False."""
         return True
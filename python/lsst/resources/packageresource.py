@@ -42,6 +42,8 @@ class PackageResourcePath(ResourcePath):
     resource name.
     """
 
+    __slots__ = ()
+
     def _get_ref(self) -> resources.abc.Traversable | None:
         """Obtain the object representing the resource.
 
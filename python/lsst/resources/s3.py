@@ -21,7 +21,7 @@ import re
 import sys
 import threading
 from collections.abc import Iterable, Iterator
-from functools import cache, cached_property
+from functools import cache
 from typing import IO, TYPE_CHECKING, cast
 
 from botocore.exceptions import ClientError
@@ -148,11 +148,13 @@ class S3ResourcePath(ResourcePath):
     within threads other than python's main thread.
     """
 
+    __slots__ = ()
+
     use_threads: bool | None = None
     """Explicitly turn on or off threading in use of boto's download_fileobj.
     Setting this to None results in boto's default behavior."""
 
-    @cached_property
+    @property
     def _environ_use_threads(self) -> bool | None:
         try:
             use_threads_str = os.environ["LSST_S3_USE_THREADS"]
@@ -165,13 +167,14 @@ class S3ResourcePath(ResourcePath):
 
     @property
     def _transfer_config(self) -> TransferConfig:
-        if self.use_threads is None:
-            self.use_threads = self._environ_use_threads
+        use_threads = self.use_threads
+        if use_threads is None:
+            use_threads = self._environ_use_threads
 
-        if self.use_threads is None:
+        if use_threads is None:
             transfer_config = TransferConfig()
         else:
-            transfer_config = TransferConfig(use_threads=self.use_threads)
+            transfer_config = TransferConfig(use_threads=use_threads)
 
         return transfer_config
 
@@ -22,7 +22,7 @@ from pathlib import PurePath
 
 from ._resourcePath import ResourcePath
 from .file import FileResourcePath
-from .utils import os2posix
+from .utils import os2posix, quote_path
 
 log = logging.getLogger(__name__)
 
@@ -30,6 +30,8 @@ log = logging.getLogger(__name__)
 class SchemelessResourcePath(FileResourcePath):
     """Scheme-less URI referring to the local file system or relative URI."""
 
+    __slots__ = ()
+
     _pathLib = PurePath
     _pathModule = os.path
     quotePaths = False
@@ -265,7 +267,7 @@ class SchemelessResourcePath(FileResourcePath):
         if "scheme" in replacements:
             # This is now meant to be a URI path so force to posix
             # and quote
-            replacements["path"] = urllib.parse.quote(os2posix(replacements["path"]))
+            replacements["path"] = quote_path(os2posix(replacements["path"]))
 
         # ParseResult is a NamedTuple so _replace is standard API
         parsed = parsed._replace(**replacements)
@@ -475,6 +475,7 @@ class GenericTestCase(_GenericTestCase):
         add_dir = root.join("b/c/d/")
         self.assertTrue(add_dir.isdir())
         self.assertEqual(add_dir.geturl(), f"{root_str}b/c/d/")
+        self.assertEqual(root.join("b/c/d", forceDirectory=True), add_dir)
 
         up_relative = root.join("../b/c.txt")
         self.assertFalse(up_relative.isdir())
@@ -17,9 +17,11 @@ import contextlib
 import logging
 import os
 import posixpath
+import re
 import shutil
 import stat
 import tempfile
+import urllib.parse
 from collections.abc import Callable, Iterator
 from pathlib import Path, PurePath, PurePosixPath
 from typing import Any, Protocol
@@ -32,6 +34,9 @@ IS_POSIX = os.sep == posixpath.sep
 # posix means posix and only determine explicitly in the non-posix case.
 OS_ROOT_PATH = posixpath.sep if IS_POSIX else Path().resolve().root
 
+# Regex matching paths that urllib.parse.quote would return unchanged.
+_SAFE_PATH_RE = re.compile(r"[A-Za-z0-9_.~/-]*")
+
 log = logging.getLogger(__name__)
 
 
@@ -93,6 +98,29 @@ def posix2os(posix: PurePath | str) -> str:
     return os.path.join(*paths)
 
 
+def quote_path(path: str) -> str:
+    """Quote a URI path.
+
+    Parameters
+    ----------
+    path : `str`
+        Path to quote.
+
+    Returns
+    -------
+    quoted : `str`
+        Path quoted as by `urllib.parse.quote`.
+
+    Notes
+    -----
+    Most paths do not need quoting so check for that before calling
+    `urllib.parse.quote`, which always encodes and decodes the string.
+    """
+    if _SAFE_PATH_RE.fullmatch(path):
+        return path
+    return urllib.parse.quote(path)
+
+
 class NoTransaction:
     """A simple emulation of the
     `~lsst.daf.butler.core.datastore.DatastoreTransaction` class.
@@ -11,6 +11,7 @@
 
 import hashlib
 import io
+import logging
 import os.path
 import random
 import shutil
@@ -24,6 +25,7 @@ import warnings
 from collections.abc import Callable
 from threading import Thread
 from typing import cast
+from unittest import mock
 
 try:
     from cheroot import wsgi
@@ -45,6 +47,7 @@ from lsst.resources.http import (
     HttpResourcePathConfig,
     SessionStore,
     _is_protected,
+    _parse_propfind_response_body,
 )
 from lsst.resources.tests import GenericReadWriteTestCase, GenericTestCase
 from lsst.resources.utils import makeTestTempDir, removeTestTempDir
@@ -191,6 +194,23 @@ class HttpReadWriteWebdavTestCase(GenericReadWriteTestCase, unittest.TestCase):
             # Verify the position.
             self.assertEqual(handle.tell(), len(sub_contents))
 
+            # Bytes that have already been retrieved are read again without
+            # contacting the server.
+            with mock.patch.object(handle._session, "get", wraps=handle._session.get) as mock_get:
+                handle.seek(2)
+                self.assertEqual(handle.read(5).decode(), contents[2:7])
+                self.assertEqual(handle.tell(), 7)
+                mock_get.assert_not_called()
+
+                # The first read fetched ahead so reading on is also local.
+                self.assertEqual(handle.read(10).decode(), contents[7:17])
+                mock_get.assert_not_called()
+
+                # Reading beyond the retrieved bytes needs a new request.
+                handle._last_chunk = None
+                self.assertEqual(handle.read(5).decode(), contents[17:22])
+                mock_get.assert_called_once()
+
             # Jump back to the beginning and test if reading the whole file
             # prompts the internal buffer to be read.
             handle.seek(0)
@@ -199,6 +219,13 @@ class HttpReadWriteWebdavTestCase(GenericReadWriteTestCase, unittest.TestCase):
             self.assertIsNotNone(handle._completeBuffer)
             self.assertEqual(result, contents)
 
+            # Reading into a buffer uses the complete contents.
+            handle.seek(3)
+            buffer = bytearray(5)
+            self.assertEqual(handle.readinto(buffer), 5)
+            self.assertEqual(buffer.decode(), contents[3:8])
+            self.assertEqual(handle.tell(), 8)
+
             # Check that flush works on read-only handle.
             handle.flush()
 
@@ -233,6 +260,11 @@ class HttpReadWriteWebdavTestCase(GenericReadWriteTestCase, unittest.TestCase):
         # Creating an existing remote directory must succeed
         self.assertIsNone(subdir.mkdir())
 
+        # Missing ancestors are created as well
+        nested = subdir.join("a/b/c", forceDirectory=True)
+        self.assertIsNone(nested.mkdir())
+        self.assertTrue(nested.exists())
+
         # Deletion of an existing directory must succeed
         self.assertIsNone(subdir.remove())
 
@@ -478,6 +510,55 @@ class HttpReadWriteWebdavTestCase(GenericReadWriteTestCase, unittest.TestCase):
         HttpResourcePath._reload_config()
         os.remove(local_file)
 
+    def test_walk_prune(self):
+        # Directories removed from the list by the caller are not walked.
+        root = self.tmpdir.join(self._get_dir_name(), forceDirectory=True)
+        for path in ("a/x.txt", "b/y.txt", "b/c/z.txt", "d/e/f/w.txt"):
+            root.join(path).write(b"")
+
+        walked = []
+        propfind = HttpResourcePath._propfind
+        with mock.patch.object(HttpResourcePath, "_propfind", autospec=True, side_effect=propfind) as mocked:
+            for dirpath, dirnames, filenames in root.walk():
+                walked.append(dirpath.relative_to(root))
+                if "b" in dirnames:
+                    dirnames.remove("b")
+        self.assertEqual(walked[0], ".")
+        self.assertEqual(sorted(walked), [".", "a", "d", "d/e", "d/e/f"])
+
+        # The pruned directory was not listed.
+        listed = {call.args[0].relative_to(root) for call in mocked.call_args_list}
+        self.assertEqual(listed, set(walked))
+
+        # Stopping early is possible.
+        for dirpath, _, _ in root.walk():
+            break
+        self.assertEqual(dirpath, root)
+
+    def test_mexists_listing(self):
+        # Files in the same directory are checked by listing it.
+        root = self.tmpdir.join(self._get_dir_name(), forceDirectory=True)
+        present = [root.join(f"file {i}.txt") for i in range(12)]
+        for uri in present:
+            uri.write(b"")
+        missing = [root.join(f"missing-{i}.txt") for i in range(3)]
+        missing += [root.join(f"no-dir/file-{i}.txt") for i in range(10)]
+
+        propfind = HttpResourcePath._propfind
+        with (
+            mock.patch.object(HttpResourcePath._config, "_min_files_for_listing", 10),
+            mock.patch.object(HttpResourcePath, "_propfind", autospec=True, side_effect=propfind) as mocked,
+        ):
+            existence = ResourcePath.mexists(present + missing)
+        self.assertEqual(mocked.call_count, 2)
+        self.assertEqual(existence, {uri: uri in present for uri in present + missing})
+
+        # Listing directories is disabled by default.
+        with mock.patch.object(HttpResourcePath, "_propfind", autospec=True, side_effect=propfind) as mocked:
+            existence = ResourcePath.mexists(present + missing)
+        self.assertEqual(mocked.call_count, len(present + missing))
+        self.assertEqual(existence, {uri: uri in present for uri in present + missing})
+
     @responses.activate
     def test_is_webdav_endpoint(self):
         davEndpoint = "http://www.lsstwithwebdav.org"
@@ -492,6 +573,103 @@ class HttpReadWriteWebdavTestCase(GenericReadWriteTestCase, unittest.TestCase):
         responses.add(responses.OPTIONS, notWebdavEndpoint, status=403)
         self.assertFalse(ResourcePath(notWebdavEndpoint).is_webdav_endpoint)
 
+    @responses.activate
+    def test_file_handle_range_ignored(self):
+        # A server that ignores the Range header returns the whole file.
+        url = "http://www.rangeignored.org/file.txt"
+        contents = b"0123456789abcdef"
+        responses.add(responses.GET, url, status=200, body=contents)
+        handle = HttpReadResourceHandle(
+            "rb", logging.getLogger(__name__), ResourcePath(url), timeout=(10.0, 10.0)
+        )
+
+        # Zero-length reads do not contact the server.
+        self.assertEqual(handle.read(0), b"")
+        self.assertEqual(len(responses.calls), 0)
+
+        handle.seek(2)
+        self.assertEqual(handle.read(4), contents[2:6])
+        self.assertEqual(handle.tell(), 6)
+
+        # The body is kept so no further requests are needed.
+        self.assertEqual(handle.read(3), contents[6:9])
+        handle.seek(-2, io.SEEK_CUR)
+        self.assertEqual(handle.read(), contents[7:])
+        self.assertEqual(len(responses.calls), 1)
+
+    @responses.activate
+    def test_file_handle_range_capped(self):
+        # A server may send fewer bytes than asked for without saying how
+        # large the file is. That must not be taken as the end of the file.
+        url = "http://www.rangecapped.org/file.txt"
+        contents = b"0123456789abcdef"
+        responses.add(
+            responses.GET, url, status=206, body=contents[0:4], headers={"Content-Range": "bytes 0-3/*"}
+        )
+        responses.add(
+            responses.GET, url, status=206, body=contents[4:8], headers={"Content-Range": "bytes 4-7/*"}
+        )
+        handle = HttpReadResourceHandle(
+            "rb", logging.getLogger(__name__), ResourcePath(url), timeout=(10.0, 10.0)
+        )
+
+        self.assertEqual(handle.read(8), contents[0:4])
+        self.assertEqual(handle._total_size, -1)
+        self.assertEqual(handle.read(4), contents[4:8])
+        self.assertEqual(handle.tell(), 8)
+        self.assertEqual(len(responses.calls), 2)
+
+    @responses.activate
+    def test_open_known_size(self):
+        # The size returned by the HEAD request is reused by the handle.
+        url = "http://www.knownsize.org/file.txt"
+        contents = b"0123456789abcdef"
+        responses.add(responses.OPTIONS, "http://www.knownsize.org/", status=200)
+        responses.add(
+            responses.HEAD,
+            url,
+            status=200,
+            headers={"Accept-Ranges": "bytes", "Content-Length": str(len(contents))},
+        )
+        responses.add(
+            responses.GET,
+            url,
+            status=206,
+            body=contents[-4:],
+            headers={"Content-Range": f"bytes 12-15/{len(contents)}"},
+        )
+        with ResourcePath(url).open("rb") as handle:
+            handle.seek(-4, io.SEEK_END)
+            self.assertEqual(handle.read(), contents[-4:])
+        self.assertEqual([call.request.method for call in responses.calls], ["OPTIONS", "HEAD", "GET"])
+
+    @responses.activate
+    def test_put_unauthorized(self):
+        # The data must not be sent if the server rejects the empty PUT.
+        url = "http://www.putunauthorized.org/file.txt"
+        responses.add(responses.OPTIONS, "http://www.putunauthorized.org/", status=200)
+        responses.add(responses.PUT, url, status=403)
+        with self.assertRaises(ValueError):
+            ResourcePath(url).write(b"0123456789abcdef")
+        self.assertEqual(len([call for call in responses.calls if call.request.method == "PUT"]), 1)
+        self.assertIsNone(responses.calls[-1].request.body)
+
+    @responses.activate
+    def test_mkdir_forbidden(self):
+        # Only a "409 Conflict" means the parent is missing: other errors
+        # must be raised without trying to create the parent.
+        url = "http://www.mkdirforbidden.org/a/b/"
+        responses.add(
+            responses.OPTIONS, "http://www.mkdirforbidden.org/", status=200, headers={"DAV": "1,2,3"}
+        )
+        responses.add("PROPFIND", url, status=404)
+        responses.add("MKCOL", url, status=403)
+        with self.assertRaises(ValueError):
+            ResourcePath(url).mkdir()
+        self.assertEqual(
+            [call.request.url for call in responses.calls if call.request.method == "MKCOL"], [url]
+        )
+
     @responses.activate
     def test_plain_http_url_signing(self):
         # As in test_is_webdav_endpoint above, configure a URL to appear as a
@@ -660,6 +838,25 @@ class HttpResourcePathConfigTestCase(unittest.TestCase):
             config = HttpResourcePathConfig()
             self.assertTrue(config.send_expect_on_put)
 
+    def test_min_files_for_listing(self):
+        # Ensure environment variable LSST_HTTP_MEXISTS_MIN_FILES_FOR_LISTING
+        # is inspected to initialize the HttpResourcePathConfig class.
+        with unittest.mock.patch.dict(os.environ, {}, clear=True):
+            config = HttpResourcePathConfig()
+            self.assertEqual(config.min_files_for_listing, 0)
+
+        with unittest.mock.patch.dict(
+            os.environ, {"LSST_HTTP_MEXISTS_MIN_FILES_FOR_LISTING": "20"}, clear=True
+        ):
+            config = HttpResourcePathConfig()
+            self.assertEqual(config.min_files_for_listing, 20)
+
+        with unittest.mock.patch.dict(
+            os.environ, {"LSST_HTTP_MEXISTS_MIN_FILES_FOR_LISTING": "XXX"}, clear=True
+        ):
+            config = HttpResourcePathConfig()
+            self.assertEqual(config.min_files_for_listing, 0)
+
     def test_enable_fsspec(self):
         # Ensure environment variable LSST_HTTP_ENABLE_FSSPEC is
         # inspected to initialize the HttpResourcePathConfig class.
@@ -920,6 +1117,36 @@ class WebdavUtilsTestCase(unittest.TestCase):
             os.chmod(file_path, stat.S_IRUSR | mode)
             self.assertFalse(_is_protected(file_path))
 
+    def test_parse_propfind_response_body(self):
+        body = """<?xml version="1.0" encoding="UTF-8"?>
+        <D:multistatus xmlns:D="DAV:">
+            <D:response>
+                <D:href>/dir/file.txt</D:href>
+                <D:propstat>
+                    <D:prop>
+                        <D:resourcetype/>
+                        <D:displayname/>
+                        <D:getcontentlength>
+                            12345
+                        </D:getcontentlength>
+                    </D:prop>
+                    <D:status>
+                        HTTP/1.1 200 OK
+                    </D:status>
+                </D:propstat>
+                <D:propstat>
+                    <D:prop><D:displayname/></D:prop>
+                    <D:status>HTTP/1.1 404 Not Found</D:status>
+                </D:propstat>
+            </D:response>
+        </D:multistatus>
+        """
+        (prop,) = _parse_propfind_response_body(body)
+        self.assertTrue(prop.exists)
+        self.assertTrue(prop.is_file)
+        self.assertEqual(prop.size, 12345)
+        self.assertEqual(prop.name, "file.txt")
+
 
 class BearerTokenAuthTestCase(unittest.TestCase):
     """Test for the BearerTokenAuth class."""
@@ -975,6 +1202,18 @@ class BearerTokenAuthTestCase(unittest.TestCase):
         req = auth(requests.Request("GET", "https://example.org").prepare())
         self.assertEqual(req.headers.get("Authorization"), f"Bearer {self.token}")
 
+        # Ensure a modified token file is only read again once the refresh
+        # interval has elapsed.
+        os.chmod(token_file_path, stat.S_IRUSR | stat.S_IWUSR)
+        with open(token_file_path, "w") as f:
+            f.write("FGHIJ5678")
+        os.utime(token_file_path, (time.time() + 10, time.time() + 10))
+        req = auth(requests.Request("GET", "https://example.org").prepare())
+        self.assertEqual(req.headers.get("Authorization"), f"Bearer {self.token}")
+        auth._next_refresh = 0.0
+        req = auth(requests.Request("GET", "https://example.org").prepare())
+        self.assertEqual(req.headers.get("Authorization"), "Bearer FGHIJ5678")
+
         # Ensure an exception is raised if either group or other can read the
         # token file
         for mode in (stat.S_IRGRP, stat.S_IWGRP, stat.S_IXGRP, stat.S_IROTH, stat.S_IWOTH, stat.S_IXOTH):
@@ -15,8 +15,10 @@ import pathlib
 import pickle
 import posixpath
 import unittest
+import urllib.parse
 
 from lsst.resources import ResourcePath
+from lsst.resources._resourcePath import _urlparse
 from lsst.resources.location import Location, LocationFactory
 from lsst.resources.utils import os2posix, posix2os
 
@@ -180,6 +182,11 @@ class LocationTestCase(unittest.TestCase):
         for uri_str, result in uriStrings:
             uri = ResourcePath(uri_str)
             self.assertEqual(uri.relativeToPathRoot, result)
+            self.assertFalse(uri.is_root, f"Testing URI {uri} is not a root URI")
+
+        # A relative URI referring to the current directory is its own root.
+        self.assertTrue(ResourcePath("./", forceAbsolute=False).is_root)
+        self.assertFalse(ResourcePath("a/", forceAbsolute=False).is_root)
 
     def testUriJoin(self):
         uri = ResourcePath("a/b/c/d", forceDirectory=True, forceAbsolute=False)
@@ -329,6 +336,26 @@ class LocationTestCase(unittest.TestCase):
         loc1.updateExtension("fits")
         self.assertTrue(loc1.uri.basename(), "file.fits")
 
+    def testUriParsing(self):
+        """Test that URI strings are split as urllib would split them."""
+        testUris = (
+            "s3://bucket/a/b.txt",
+            "https://host.org:8080/a/b?q=1&r=2#frag",
+            "file:///a/b/",
+            "gs://bucket",
+            "s3://bucket/a#b#c",
+            "s3://bucket/a?b?c#d",
+            "http://host/a;params?q",
+            "http://[::1]:80/a",
+            "HTTPS://host/a",
+            "s3://bucket/a b",
+            "s3://bücket/a",
+            "file:/a/b",
+        )
+        for uri in testUris:
+            with self.subTest(uri=uri):
+                self.assertEqual(_urlparse(uri), urllib.parse.urlparse(uri))
+
     def testPosix2OS(self):
         """Test round tripping of the posix to os.path conversion helpers."""
         testPaths = ("/a/b/c.e", "a/b", "a/b/", "/a/b", "/a/b/", "a/b/c.e")